@@ -32,6 +32,93 @@ bl_info = {
 
 import bpy
 import mathutils
+import numpy as np
+
+# Numba is not shipped with Blender, use it when the user has installed it
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Transform properties that get combined, with the short names used for
+# the root custom properties, e.g. obj_loc
+_XFORM_SUFFIX = {
+    "location": "loc",
+    "rotation_euler": "rot",
+    "scale": "scale",
+}
+
+# Characters replaced in object names before they are used as property names
+_CLEAN_NAME_TABLE = str.maketrans({".": "_", " ": "_"})
+
+
+def _frame_range_loop(frames):
+    """Return the lowest and highest frame in a non-empty array"""
+    low = frames[0]
+    high = frames[0]
+    for i in range(frames.size):
+        frame = frames[i]
+        if frame < low:
+            low = frame
+        elif frame > high:
+            high = frame
+    return low, high
+
+
+def _frame_range_numpy(frames):
+    """Return the lowest and highest frame in a non-empty array"""
+    return frames.min(), frames.max()
+
+
+_frame_range = _frame_range_numpy
+if njit is not None:
+    try:
+        _frame_range = njit(cache=True, fastmath=True)(_frame_range_loop)
+    except RuntimeError:
+        # Numba can't cache functions that don't come from a file on disk,
+        # e.g. when the add-on is run from Blender's Text Editor
+        _frame_range = njit(fastmath=True)(_frame_range_loop)
+
+
+def _simplify_mask(keyframes, tolerance):
+    """Mask of the keys to keep, dropping those within tolerance of a line between the kept keys (Ramer-Douglas-Peucker)"""
+    count = len(keyframes)
+    keep = np.ones(count, dtype=bool)
+    if count < 3:
+        return keep
+    
+    frames = keyframes[:, 0]
+    values = keyframes[:, 1]
+    keep[:] = False
+    keep[0] = keep[-1] = True
+    
+    # Split spans on their worst key until every key is close enough,
+    # using a stack instead of recursion
+    spans = [(0, count - 1)]
+    while spans:
+        first, last = spans.pop()
+        if last - first < 2:
+            continue
+        
+        # How far each inner key is from the straight line between the ends,
+        # measured along the value axis since frames and values use different units
+        inner_frames = frames[first + 1:last]
+        span = frames[last] - frames[first]
+        if span > 0:
+            t = (inner_frames - frames[first]) / span
+        else:
+            t = np.zeros_like(inner_frames)
+        line = values[first] + t * (values[last] - values[first])
+        errors = np.abs(values[first + 1:last] - line)
+        
+        worst = int(np.argmax(errors))
+        if errors[worst] > tolerance:
+            split = first + 1 + worst
+            keep[split] = True
+            spans.append((first, split))
+            spans.append((split, last))
+    
+    return keep
 
 class CombineAnimationsOperator(bpy.types.Operator):
     """Combine animations into one export-ready action"""
@@ -63,19 +150,26 @@ class CombineAnimationsOperator(bpy.types.Operator):
         min=0
     )
     
+    simplify_tolerance: bpy.props.FloatProperty(
+        name="Simplify Tolerance",
+        description="Remove keyframes that differ less than this from a straight line between their neighbours (0 keeps every keyframe)",
+        default=0.0,
+        min=0.0
+    )
+    
+    use_drivers: bpy.props.BoolProperty(
+        name="Use Drivers",
+        description="Drive child objects from custom properties on the root instead of baking an action onto each child",
+        default=False
+    )
+    
     debug_mode: bpy.props.BoolProperty(
         name="Debug Mode",
         description="Print detailed information during process",
-        default=True
+        default=False
     )
 
     def execute(self, context):
-        # Store original state
-        original_mode = bpy.context.mode
-        original_active = context.view_layer.objects.active
-        original_area = bpy.context.area.type
-        original_selected = context.selected_objects.copy()
-        
         if self.debug_mode:
             self.report({'INFO'}, "Starting animation combination process...")
         
@@ -86,16 +180,28 @@ class CombineAnimationsOperator(bpy.types.Operator):
             self.report({'ERROR'}, "Please select at least one object from your rig.")
             return {'CANCELLED'}
             
-        # Make sure there's an active object
-        if not context.view_layer.objects.active and base_objects:
-            context.view_layer.objects.active = base_objects[0]
+        # Make sure there's an active object. Mode switches are run through
+        # temp_override, so the user's active object and selection are never
+        # changed and don't need restoring afterwards
+        active_object = context.view_layer.objects.active
+        if not active_object:
+            active_object = base_objects[0]
             if self.debug_mode:
-                self.report({'INFO'}, f"Setting active object to: {base_objects[0].name}")
+                self.report({'INFO'}, f"Using active object: {active_object.name}")
+        override = {
+            "active_object": active_object,
+            "object": active_object,
+            "selected_objects": base_objects,
+        }
+        
+        # Store original state
+        original_mode = active_object.mode
         
         # Ensure we're in object mode
         try:
-            if context.object and context.object.mode != 'OBJECT':
-                bpy.ops.object.mode_set(mode='OBJECT')
+            if original_mode != 'OBJECT':
+                with context.temp_override(**override):
+                    bpy.ops.object.mode_set(mode='OBJECT')
         except RuntimeError as e:
             self.report({'WARNING'}, f"Note: {str(e)}. Continuing anyway.")
         
@@ -116,7 +222,8 @@ class CombineAnimationsOperator(bpy.types.Operator):
         # Find all animated objects
         animated_objects = []
         for obj in all_objects:
-            if obj.animation_data and obj.animation_data.action:
+            anim_data = obj.animation_data
+            if anim_data and anim_data.action:
                 animated_objects.append(obj)
                 
         if not animated_objects:
@@ -144,133 +251,148 @@ class CombineAnimationsOperator(bpy.types.Operator):
             self.report({'INFO'}, f"Animation range: {min_frame} to {max_frame}")
         
         # Create a single standalone action
-        result = self.create_standalone_action(context, root_object, animated_objects, 
-                                          min_frame, max_frame)
-        
-        # Restore original selection
-        bpy.ops.object.select_all(action='DESELECT')
-        for obj in original_selected:
-            if obj and obj.name in bpy.data.objects:
-                obj.select_set(True)
-        if original_active and original_active.name in bpy.data.objects:
-            context.view_layer.objects.active = original_active
+        if len(animated_objects) == 1 and animated_objects[0] == root_object:
+            # Only the root is animated, its action just needs to be copied
+            result = self.copy_root_action(root_object)
+        else:
+            result = self.create_standalone_action(context, root_object, animated_objects, 
+                                              min_frame, max_frame)
         
         # Restore original state
-        bpy.context.area.type = original_area
-        try:
-            bpy.ops.object.mode_set(mode=original_mode)
-        except:
-            pass
+        if original_mode != 'OBJECT':
+            try:
+                with context.temp_override(**override):
+                    bpy.ops.object.mode_set(mode=original_mode)
+            except RuntimeError:
+                pass
             
         return result
     
     def create_standalone_action(self, context, root_object, animated_objects, min_frame, max_frame):
-        """Create a truly combined animation driving all objects from a single action"""
-        # Create a new action for the root
-        master_action = bpy.data.actions.new(name=self.target_action_name)
-        master_action.use_fake_user = True
+        """Combine the hierarchy into one action on the root, plus a baked action per child (or drivers reading from the root)"""
+        # Start the root's action from a copy of its own, so it keeps every
+        # channel exactly as copy_root_action() would
+        root_anim_data = root_object.animation_data
+        root_action = root_anim_data.action if root_anim_data else None
+        if root_action:
+            master_action = self.copy_action(root_action, self.target_action_name)
+        else:
+            master_action = bpy.data.actions.new(name=self.target_action_name)
+            master_action.use_fake_user = True
         
-        # Store original frame
-        original_frame = context.scene.frame_current
         original_actions = {}
         
         # First collect all animation data
-        animation_data = {}  # Will store {obj_name: {prop_name: {axis: [(frame, value)]}}}
+        animation_data = {}  # Will store {(obj_name, prop_name, axis): ndarray[n, 2] of (frame, value)}
         
         if self.debug_mode:
             self.report({'INFO'}, "Collecting animation data from all objects...")
         
-        # Collect all keyframe data from all animations
+        baked_actions = {}
+        
+        # Collect all keyframe data from all animations. This stays on the
+        # main thread: bpy data must not be read from other threads, and
+        # foreach_get keeps the GIL while copying
         for obj in animated_objects:
-            if not obj.animation_data or not obj.animation_data.action:
+            anim_data = obj.animation_data
+            if not anim_data:
+                continue
+            action = anim_data.action
+            if not action:
                 continue
             
             # Store original action
-            original_actions[obj] = obj.animation_data.action
+            original_actions[obj] = action
+            
+            # The root's curves are already in the master action
+            if obj == root_object:
+                continue
+            
+            if not self.use_drivers:
+                # Without drivers, every child gets a copy of its own action
+                # that shares the master action's name stem. The copy keeps
+                # every channel, and nothing has to be re-evaluated through
+                # the root each frame
+                obj_action = self.copy_action(action, f"{self.target_action_name}_{obj.name}")
+                anim_data.action = obj_action
+                baked_actions[obj.name] = obj_action
+                continue
             
             # Get animation data
-            obj_data = {}
-            for fcurve in obj.animation_data.action.fcurves:
-                # Parse the data path and index
-                prop_name = fcurve.data_path
-                axis = fcurve.array_index
-                
-                # Store keyframe data
-                keyframes = []
-                for kf in fcurve.keyframe_points:
-                    keyframes.append((kf.co[0], kf.co[1]))
-                
-                # Initialize property dict if needed
-                if prop_name not in obj_data:
-                    obj_data[prop_name] = {}
-                
-                # Store axis keyframes
-                obj_data[prop_name][axis] = keyframes
-                
-            # Add to animation data
-            if obj_data:
-                animation_data[obj.name] = obj_data
+            animation_data.update(self.collect_keyframes(obj.name, action))
         
         # Ensure root has animation data
-        if not root_object.animation_data:
-            root_object.animation_data_create()
+        if not root_anim_data:
+            root_anim_data = root_object.animation_data_create()
         
         # Assign the action to the root object
-        root_object.animation_data.action = master_action
+        root_anim_data.action = master_action
+        
+        # Map names back to objects once instead of looking each one up in bpy.data
+        name_to_obj = {obj.name: obj for obj in animated_objects}
         
         # Use a simpler naming convention for custom properties
-        # Keep track of properties we need to create
+        # Keep track of properties we need to create, they are added to
+        # the root in one go once every name is known
         custom_props_to_create = {}
         
+        # Custom property name and driven axes for each
+        # (object name, property name)
+        prop_keys = {}
+        driven_axes = {}
+        
+        # Per-curve debug details are buffered and printed once at the end,
+        # reporting each one would update the info area thousands of times
+        debug_log = []
+        
         # First pass: Create all the F-curves in the action
-        for obj_name, props in animation_data.items():
-            is_root = (obj_name == root_object.name)
+        for (obj_name, prop_name, axis), keyframes in animation_data.items():
+            # Only child transform curves were collected, this gives the
+            # custom property suffix used with drivers
+            suffix = _XFORM_SUFFIX[prop_name]
+            
+            # Each transform is stored as one 3-float vector property,
+            # so drivers look their value up in a root property group
+            # a third the size of one property per axis
+            prop_id = (obj_name, prop_name)
+            prop_key = prop_keys.get(prop_id)
+            if prop_key is None:
+                # Use a simpler naming scheme with fewer special characters
+                # Replace problematic characters
+                clean_obj_name = obj_name.translate(_CLEAN_NAME_TABLE)
+                
+                # Create a simple custom property name
+                # Format: obj_loc, obj_rot, obj_scale
+                prop_key = f"{clean_obj_name}_{suffix}"
+                prop_keys[prop_id] = prop_key
+                driven_axes[prop_id] = []
+                
+                # Queue the property if it doesn't exist
+                if prop_key not in root_object and prop_key not in custom_props_to_create:
+                    if self.debug_mode:
+                        debug_log.append(f"Creating custom property: {prop_key}")
+                    custom_props_to_create[prop_key] = [0.0, 0.0, 0.0]
+            driven_axes[prop_id].append(axis)
             
-            for prop_name, axes in props.items():
-                for axis, keyframes in axes.items():
-                    if is_root and prop_name in ["location", "rotation_euler", "scale"]:
-                        # Direct animation on root
-                        fc = master_action.fcurves.new(data_path=prop_name, index=axis)
-                        for frame, value in keyframes:
-                            fc.keyframe_points.insert(frame=frame, value=value)
-                    else:
-                        # Use a simpler naming scheme with fewer special characters
-                        # Replace problematic characters
-                        clean_obj_name = obj_name.replace('.', '_').replace(' ', '_')
-                        
-                        if prop_name in ["location", "rotation_euler", "scale"]:
-                            # Standard transform properties
-                            component = ["x", "y", "z"][axis]
-                            
-                            # Create a simple custom property name
-                            # Format: obj_loc_x, obj_rot_y, obj_scale_z
-                            if prop_name == "location":
-                                prop_key = f"{clean_obj_name}_loc_{component}"
-                            elif prop_name == "rotation_euler":
-                                prop_key = f"{clean_obj_name}_rot_{component}"
-                            else:  # scale
-                                prop_key = f"{clean_obj_name}_scale_{component}"
-                                
-                            # Create the property if it doesn't exist
-                            if prop_key not in root_object:
-                                if self.debug_mode:
-                                    self.report({'INFO'}, f"Creating custom property: {prop_key}")
-                                root_object[prop_key] = 0.0
-                                custom_props_to_create[prop_key] = True
-                            
-                            # Create the F-curve for this property
-                            fc = master_action.fcurves.new(data_path=f'["{prop_key}"]')
-                            
-                            # Add keyframes
-                            for frame, value in keyframes:
-                                fc.keyframe_points.insert(frame=frame, value=value)
-        
-        # Second pass: Create drivers on all objects
-        for obj_name, props in animation_data.items():
-            if obj_name == root_object.name:
-                continue  # Skip root object - it's animated directly
+            # Create the F-curve for this axis of the property, replacing
+            # one the root's copied action may already have
+            data_path = f'["{prop_key}"]'
+            old_fc = master_action.fcurves.find(data_path, index=axis)
+            if old_fc:
+                master_action.fcurves.remove(old_fc)
+            fc = master_action.fcurves.new(data_path=data_path, index=axis)
             
-            obj = bpy.data.objects.get(obj_name)
+            # Add keyframes
+            self.write_keyframes(fc, keyframes)
+    
+        # Create all queued custom properties on the root at once
+        if custom_props_to_create:
+            root_object.id_properties_ensure().update(custom_props_to_create)
+        
+        # Second pass: Create drivers on all objects (only filled in when
+        # using drivers, the root keeps its own curves)
+        for (obj_name, prop_name), axes in driven_axes.items():
+            obj = name_to_obj.get(obj_name)
             if not obj:
                 continue
             
@@ -278,89 +400,217 @@ class CombineAnimationsOperator(bpy.types.Operator):
             if not obj.animation_data:
                 obj.animation_data_create()
             
-            # Clean object name for property lookup
-            clean_obj_name = obj_name.replace('.', '_').replace(' ', '_')
+            # Reuse the property name from the first pass
+            prop_key = prop_keys[(obj_name, prop_name)]
             
-            # Set up drivers for each property
-            for prop_name, axes in props.items():
-                if prop_name not in ["location", "rotation_euler", "scale"]:
-                    continue  # Skip non-transform properties
+            # Create the drivers, all axes at once with a single
+            # driver_add() when every axis is animated
+            try:
+                if len(axes) == 3:
+                    # Remove any existing drivers
+                    obj.driver_remove(prop_name)
+                    driver_fcurves = obj.driver_add(prop_name)
+                else:
+                    driver_fcurves = []
+                    for axis in axes:
+                        obj.driver_remove(prop_name, axis)
+                        driver_fcurves.append(obj.driver_add(prop_name, axis))
+            except Exception as e:
+                self.report({'WARNING'}, f"Error creating drivers for {obj.name}.{prop_name}: {str(e)}")
+                continue
+        
+            for driver_fc in driver_fcurves:
+                axis = driver_fc.array_index
+            
+                # Make the driver read from the custom property
+                try:
+                    driver = driver_fc.driver
                 
-                for axis, keyframes in axes.items():
-                    # Get the component name
-                    component = ["x", "y", "z"][axis]
-                    
-                    # Get the property key
-                    if prop_name == "location":
-                        prop_key = f"{clean_obj_name}_loc_{component}"
-                    elif prop_name == "rotation_euler":
-                        prop_key = f"{clean_obj_name}_rot_{component}"
-                    else:  # scale
-                        prop_key = f"{clean_obj_name}_scale_{component}"
+                    # Add variable
+                    var = driver.variables.new()
+                    var.name = "value"
+                    var.type = 'SINGLE_PROP'
+                
+                    # Target the custom property on the root object
+                    target = var.targets[0]
+                    target.id = root_object
+                    target.data_path = f'["{prop_key}"][{axis}]'
+                
+                    # Set the expression
+                    driver.expression = "value"
+                
+                    if self.debug_mode:
+                        debug_log.append(f"Created driver for {obj.name}.{prop_name}[{axis}] reading from {prop_key}[{axis}]")
                     
-                    # Create a driver that reads from the custom property
-                    try:
-                        # Remove any existing driver
-                        obj.driver_remove(prop_name, axis)
-                        
-                        # Create new driver
-                        driver = obj.driver_add(prop_name, axis).driver
-                        
-                        # Add variable
-                        var = driver.variables.new()
-                        var.name = "value"
-                        var.type = 'SINGLE_PROP'
-                        
-                        # Target the custom property on the root object
-                        var.targets[0].id = root_object
-                        var.targets[0].data_path = f'["{prop_key}"]'
-                        
-                        # Set the expression
-                        driver.expression = "value"
-                        
-                        if self.debug_mode:
-                            self.report({'INFO'}, f"Created driver for {obj.name}.{prop_name}[{axis}] reading from {prop_key}")
-                            
-                    except Exception as e:
-                        self.report({'WARNING'}, f"Error creating driver for {obj.name}.{prop_name}[{axis}]: {str(e)}")
-        
-        # Update the scene
-        context.view_layer.update()
+                except Exception as e:
+                    self.report({'WARNING'}, f"Error creating driver for {obj.name}.{prop_name}[{axis}]: {str(e)}")
         
         # Remove original actions if not keeping them
         if not self.keep_original_actions:
             for obj in animated_objects:
-                if obj != root_object and obj.animation_data and obj.animation_data.action:
-                    # Remove NLA tracks first
-                    if obj.animation_data.nla_tracks:
-                        while obj.animation_data.nla_tracks:
-                            obj.animation_data.nla_tracks.remove(obj.animation_data.nla_tracks[0])
+                if obj == root_object:
+                    continue
+                anim_data = obj.animation_data
+                if anim_data and anim_data.action:
+                    # Remove NLA tracks first, from a snapshot of the
+                    # collection so each track is removed by reference
+                    nla_tracks = anim_data.nla_tracks
+                    for track in list(nla_tracks):
+                        nla_tracks.remove(track)
                     
-                    # Remove action
-                    if obj != root_object and obj.animation_data:
-                        obj.animation_data.action = None
+                    # Remove action (baked children keep their new one)
+                    if self.use_drivers:
+                        anim_data.action = None
+        else:
+            # The originals may no longer be assigned to anything, so make
+            # sure they survive saving the file
+            for action in original_actions.values():
+                action.use_fake_user = True
+        
+        # Update the scene once, after all actions, drivers and NLA tracks
+        # have been changed. The current frame is never changed above, so
+        # this single evaluation replaces the old frame_set() round trip
+        context.view_layer.update()
         
-        # Restore original frame
-        context.scene.frame_set(original_frame)
+        if debug_log:
+            print("\n".join(debug_log))
+            self.report({'INFO'}, f"Printed {len(debug_log)} property and driver details to the console")
         
-        self.report({'INFO'}, f"Created combined animation with {len(custom_props_to_create)} custom properties")
+        if self.use_drivers:
+            self.report({'INFO'}, f"Created combined animation with {len(custom_props_to_create)} custom properties")
+        else:
+            self.report({'INFO'}, f"Created combined animation with {len(baked_actions)} baked child actions")
         
         return {'FINISHED'}
         
+    def collect_keyframes(self, obj_name, action):
+        """Read the transform F-curves of an action into {(obj_name, prop_name, axis): ndarray[n, 2]}"""
+        tolerance = self.simplify_tolerance
+        keyframe_data = {}
+        
+        for fcurve in action.fcurves:
+            # Only transform curves are combined or simplified, so don't
+            # copy the keys of anything else
+            if fcurve.data_path not in _XFORM_SUFFIX:
+                continue
+            
+            # Store keyframe data as an (n, 2) array of (frame, value)
+            points = fcurve.keyframe_points
+            count = len(points)
+            coords = np.empty(2 * count, dtype=np.float32)
+            points.foreach_get("co", coords)
+            keyframes = coords.reshape(count, 2)
+            
+            # Drop redundant keys before anything is written
+            if tolerance > 0.0:
+                keyframes = keyframes[_simplify_mask(keyframes, tolerance)]
+            
+            # Key by the data path and index
+            keyframe_data[(obj_name, fcurve.data_path, fcurve.array_index)] = keyframes
+        
+        return keyframe_data
+    
+    def simplify_action(self, action):
+        """Remove redundant keys from the transform F-curves of an action in place"""
+        tolerance = self.simplify_tolerance
+        
+        for fcurve in action.fcurves:
+            if fcurve.data_path not in _XFORM_SUFFIX:
+                continue
+            
+            points = fcurve.keyframe_points
+            count = len(points)
+            coords = np.empty(2 * count, dtype=np.float32)
+            points.foreach_get("co", coords)
+            keep = _simplify_mask(coords.reshape(count, 2), tolerance)
+            if keep.all():
+                continue
+            
+            # Only delete the dropped points, so the kept keys keep their
+            # interpolation and handles and the curve keeps its modifiers.
+            # Going backwards leaves the indices still to visit unchanged
+            for index in np.flatnonzero(~keep)[::-1]:
+                points.remove(points[int(index)], fast=True)
+            
+            # Recalculate handles once for the whole curve
+            fcurve.update()
+    
+    def copy_action(self, action, name):
+        """Copy an action under a new name, simplifying its transform curves if asked to"""
+        new_action = action.copy()
+        new_action.name = name
+        new_action.use_fake_user = True
+        
+        # Curves are simplified in place rather than rewritten
+        if self.simplify_tolerance > 0.0:
+            self.simplify_action(new_action)
+        
+        return new_action
+    
+    def copy_root_action(self, root_object):
+        """Use a copy of the root's own action when nothing else is animated"""
+        anim_data = root_object.animation_data
+        original_action = anim_data.action
+        
+        master_action = self.copy_action(original_action, self.target_action_name)
+        anim_data.action = master_action
+        
+        # The original is no longer assigned, keep it around if asked to
+        if self.keep_original_actions:
+            original_action.use_fake_user = True
+        
+        self.report({'INFO'}, f"Created combined animation from {original_action.name}")
+        
+        return {'FINISHED'}
+    
+    def write_keyframes(self, fcurve, keyframes):
+        """Write an (n, 2) array of (frame, value) pairs to an F-curve in one batch"""
+        count = len(keyframes)
+        if count == 0:
+            return
+        
+        # Flatten to [frame0, value0, frame1, value1, ...] for foreach_set
+        coords = np.ascontiguousarray(keyframes, dtype=np.float32).ravel()
+        
+        # Allocate all points at once and write them with a single call
+        # instead of one keyframe_points.insert() per key. Nothing is sorted
+        # while writing, unlike insert() (even with options={'FAST'}).
+        # New points already use BEZIER interpolation with auto handles
+        points = fcurve.keyframe_points
+        points.add(count)
+        points.foreach_set("co", coords)
+        
+        # Sort and recalculate handles once for the whole curve
+        fcurve.update()
+    
     def find_animation_range(self, objects):
         """Find the overall animation range from all objects"""
-        min_frame = float('inf')
-        max_frame = float('-inf')
-        
+        actions = []
         for obj in objects:
-            if obj.animation_data and obj.animation_data.action:
-                action = obj.animation_data.action
-                for fcurve in action.fcurves:
-                    if len(fcurve.keyframe_points) > 0:
-                        min_frame = min(min_frame, fcurve.keyframe_points[0].co[0])
-                        max_frame = max(max_frame, fcurve.keyframe_points[-1].co[0])
-        
-        return min_frame, max_frame
+            anim_data = obj.animation_data
+            action = anim_data.action if anim_data else None
+            if action:
+                actions.append(action)
+        
+        # Gather the frames into one preallocated buffer and reduce it once
+        frames = np.empty(2 * sum(len(action.fcurves) for action in actions), dtype=np.float32)
+        count = 0
+        for action in actions:
+            for fcurve in action.fcurves:
+                # Blender keeps keyframe points sorted by frame, so only
+                # the first and last key of each curve matter
+                points = fcurve.keyframe_points
+                if not points:
+                    continue
+                frames[count] = points[0].co[0]
+                frames[count + 1] = points[-1].co[0]
+                count += 2
+        
+        if count == 0:
+            return float('inf'), float('-inf')
+        
+        min_frame, max_frame = _frame_range(frames[:count])
+        return float(min_frame), float(max_frame)
     
     def find_root_object(self, objects):
         """Find the topmost parent object"""
@@ -374,31 +624,62 @@ class CombineAnimationsOperator(bpy.types.Operator):
             if "visual" in obj.name.lower():
                 return obj
                 
-        # If not found, get the object with most children
+        # If not found, walk up from every object to its topmost selected
+        # ancestor. Anything below another selected object can't be the root
+        selected = set(objects)
+        candidates = {}
+        for obj in objects:
+            while obj.parent and obj.parent in selected:
+                obj = obj.parent
+            candidates[obj] = True
+        candidates = list(candidates)
+        
+        if len(candidates) == 1:
+            return candidates[0]
+        
+        # Several separate hierarchies, get the one with most children
+        subtree_sizes = self.count_subtree_sizes(candidates)
         max_children = -1
         root_obj = None
         
-        for obj in objects:
+        for obj in candidates:
             # Count all descendants
-            descendants = self.count_descendants(obj)
+            descendants = subtree_sizes[obj] - 1
             if descendants > max_children:
                 max_children = descendants
                 root_obj = obj
                 
         return root_obj
     
-    def count_descendants(self, obj):
-        """Count all descendants of an object"""
-        count = len(obj.children)
-        for child in obj.children:
-            count += self.count_descendants(child)
-        return count
+    def count_subtree_sizes(self, objects):
+        """Count every object in the subtrees of the given objects in one traversal"""
+        # Iterative post-order walk shared by all candidates: each object's
+        # children are queried once and every subtree is sized only once
+        sizes = {}
+        for start in objects:
+            stack = [(start, None)]
+            while stack:
+                obj, children = stack.pop()
+                if obj in sizes:
+                    continue
+                if children is None:
+                    # First visit: come back to this object after its children
+                    children = obj.children
+                    stack.append((obj, children))
+                    stack.extend((child, None) for child in children if child not in sizes)
+                else:
+                    sizes[obj] = 1 + sum(sizes[child] for child in children)
+        return sizes
     
     def get_hierarchy_objects(self, root_obj):
         """Get all objects in a hierarchy"""
-        objects = [root_obj]
-        for child in root_obj.children:
-            objects.extend(self.get_hierarchy_objects(child))
+        objects = []
+        stack = [root_obj]
+        while stack:
+            obj = stack.pop()
+            objects.append(obj)
+            # Reverse so children are visited in their original order
+            stack.extend(reversed(obj.children))
         return objects
         
     def invoke(self, context, event):
@@ -449,6 +730,12 @@ class CombineAnimationsPanel(bpy.types.Panel):
         row = options_box.row()
         row.prop(context.scene, "ca_frame_margin", text="Frame Margin")
         
+        row = options_box.row()
+        row.prop(context.scene, "ca_simplify_tolerance", text="Simplify Tolerance")
+        
+        row = options_box.row()
+        row.prop(context.scene, "ca_use_drivers", text="Use Drivers")
+        
         row = options_box.row()
         row.prop(context.scene, "ca_debug_mode", text="Debug Mode")
         
@@ -458,6 +745,8 @@ class CombineAnimationsPanel(bpy.types.Panel):
         op.keep_original_actions = context.scene.ca_keep_originals
         op.add_root_track = context.scene.ca_add_root_track
         op.frame_margin = context.scene.ca_frame_margin
+        op.simplify_tolerance = context.scene.ca_simplify_tolerance
+        op.use_drivers = context.scene.ca_use_drivers
         op.debug_mode = context.scene.ca_debug_mode
 
 
@@ -482,10 +771,23 @@ def register():
         min=0
     )
     
+    bpy.types.Scene.ca_simplify_tolerance = bpy.props.FloatProperty(
+        name="Simplify Tolerance",
+        description="Remove keyframes that differ less than this from a straight line between their neighbours (0 keeps every keyframe)",
+        default=0.0,
+        min=0.0
+    )
+    
+    bpy.types.Scene.ca_use_drivers = bpy.props.BoolProperty(
+        name="Use Drivers",
+        description="Drive child objects from custom properties on the root instead of baking an action onto each child",
+        default=False
+    )
+    
     bpy.types.Scene.ca_debug_mode = bpy.props.BoolProperty(
         name="Debug Mode",
         description="Print detailed information during process",
-        default=True
+        default=False
     )
     
     bpy.utils.register_class(CombineAnimationsOperator)
@@ -497,6 +799,8 @@ def unregister():
     del bpy.types.Scene.ca_keep_originals
     del bpy.types.Scene.ca_add_root_track
     del bpy.types.Scene.ca_frame_margin
+    del bpy.types.Scene.ca_simplify_tolerance
+    del bpy.types.Scene.ca_use_drivers
     del bpy.types.Scene.ca_debug_mode
     
     bpy.utils.unregister_class(CombineAnimationsOperator)